@@ -13,34 +13,47 @@ What it does:
 from __future__ import annotations
 
 import asyncio
+import os
 import sys
+import time
+from contextlib import contextmanager
 from datetime import date, datetime
 
-import nest_asyncio
+import numpy as np
 import pandas as pd
 import streamlit as st
 
-from config import APP_CONFIG, EMAIL_CONFIG
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from background import get_refresher, run_coro
+from config import (
+    APP_CONFIG,
+    APPOINTMENTS_CACHE_FILE,
+    APPOINTMENTS_LOCK_FILE,
+    DISPLAY_DATETIME_FMT,
+    EMAIL_CONFIG,
+)
 from fetch_appointments import fetch_appointments
 from send_email import (
     filter_new_earliest,
+    flush_state,
     load_state,
-    prepare_notification_body,
+    notify_all,
     save_state,
-    send_email,
 )
 
-# Windows event loop setup
+# Windows event loop setup (must happen before the background loop is created)
 if sys.platform.startswith("win"):
     asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
-nest_asyncio.apply()
 
 # Constants
 APPOINTMENT_PAGE_URL = "https://telegov.njportal.com/njmvc/AppointmentWizard/11"
 REFRESH_MINUTES = APP_CONFIG.refresh_minutes
 REFRESH_SECS = REFRESH_MINUTES * 60
 REFRESH_MS = REFRESH_SECS * 1000
-DATE_FORMAT = "%Y-%m-%d %I:%M %p"
 
 HIGHLIGHT_ROW_STYLE = (
     "background-color:#1b5e20;"
@@ -51,20 +64,114 @@ HIGHLIGHT_ROW_STYLE = (
 
 
 # ---------------------------------------------------------------------------
-# Cached scrape
+# Cached scrape (shared on disk across Streamlit processes / restarts)
 # ---------------------------------------------------------------------------
-@st.cache_data(ttl=REFRESH_SECS)
-def load_appointments_cached():
+def _read_shared_cache() -> pd.DataFrame | None:
+    """
+    Return the on-disk scrape if it is younger than REFRESH_SECS, else None.
+    """
+    try:
+        age = time.time() - os.path.getmtime(APPOINTMENTS_CACHE_FILE)
+        if age < REFRESH_SECS:
+            return pd.read_pickle(APPOINTMENTS_CACHE_FILE)
+    except Exception:
+        pass
+    return None
+
+
+def _write_shared_cache(df: pd.DataFrame) -> None:
+    """
+    Atomically replace the on-disk scrape (best effort).
+    """
+    tmp = APPOINTMENTS_CACHE_FILE.with_suffix(".tmp")
+    try:
+        df.to_pickle(tmp)
+        os.replace(tmp, APPOINTMENTS_CACHE_FILE)
+    except Exception:
+        pass
+
+
+@contextmanager
+def _scrape_lock():
     """
-    Scrape and cache appointment data for REFRESH_MINUTES.
+    Cross-process exclusive lock so only one process scrapes at a time.
+    No-op where fcntl is unavailable (Windows).
+    """
+    with open(APPOINTMENTS_LOCK_FILE, "a") as fh:
+        if fcntl is not None:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _load_or_scrape() -> pd.DataFrame:
+    """
+    Return the shared on-disk scrape if fresh, otherwise scrape (once across
+    all processes sharing the state directory) and store it.
+
+    fetch_appointments swallows its own errors and returns an empty frame, so
+    an empty result is treated as a failed scrape and never written to disk.
     """
-    return asyncio.run(
-        fetch_appointments(
-            target_locations=None,
-            headless=APP_CONFIG.headless,
-            timeout_ms=APP_CONFIG.scrape_timeout_ms,
+    df = _read_shared_cache()
+    if df is not None:
+        return df
+    with _scrape_lock():
+        # Another process may have refreshed the cache while we waited
+        df = _read_shared_cache()
+        if df is not None:
+            return df
+        df = run_coro(
+            fetch_appointments(
+                target_locations=None,
+                headless=APP_CONFIG.headless,
+                timeout_ms=APP_CONFIG.scrape_timeout_ms,
+            )
         )
+        if not df.empty:
+            _write_shared_cache(df)
+        return df
+
+
+def load_appointments_cached() -> pd.DataFrame | None:
+    """
+    Return the latest appointment snapshot (as a DataFrame), or None if the
+    first background scrape failed. Blocks only until the first scrape is done.
+    """
+    refresher = get_refresher(_load_or_scrape, REFRESH_SECS)
+    refresher.ready.wait()
+    return refresher.latest()
+
+
+@st.cache_data(ttl=REFRESH_SECS)
+def build_display_frame(scraped: pd.DataFrame):
+    """
+    Sort the scraped frame and shape the table payload once per scrape
+    (not once per rerun).
+
+    Args:
+        scraped: Output of fetch_appointments (already carries ParsedDateTime).
+
+    Returns:
+        (df, appt_dates, all_locations, display_df): DataFrame sorted by
+        ParsedDateTime, the per-row appointment dates used as the base for the
+        cutoff highlight mask, the sorted unique location names for the sidebar,
+        and the ready-to-render table (Location, Next Available, Directions).
+    """
+    df = scraped.sort_values("ParsedDateTime", kind="stable").reset_index(drop=True)
+    all_locations = tuple(sorted(df["Location"].unique()))
+    display_df = pd.DataFrame(
+        {
+            "Location": df["Location"],
+            "Next Available": df["ParsedDateTime"]
+            .dt.strftime(DISPLAY_DATETIME_FMT)
+            .fillna("Unknown"),
+            "Directions": df["Map Link"],
+        }
     )
+    return df, df["ParsedDateTime"].dt.date, all_locations, display_df
 
 
 # ---------------------------------------------------------------------------
@@ -74,26 +181,15 @@ def build_highlight_styler(df: pd.DataFrame, early_mask: pd.Series):
     """
     Highlight rows where early_mask == True.
     """
-    def style_row(row):
-        return [HIGHLIGHT_ROW_STYLE] * len(row) if early_mask.loc[row.name] else [""] * len(row)
-
-    styler = df.style.apply(style_row, axis=1).set_table_styles(
-        [
-            {
-                "selector": "table",
-                "props": [
-                    ("border-collapse", "collapse"),
-                    ("width", "100%"),
-                    ("font-size", "0.90rem"),
-                ],
-            }
-        ]
+    # One vectorized (rows x cols) CSS grid instead of a per-row callback
+    mask = early_mask.reindex(df.index, fill_value=False).to_numpy(dtype=bool)
+    styles = np.where(mask[:, None], HIGHLIGHT_ROW_STYLE, "")
+    styles = np.broadcast_to(styles, (len(df), len(df.columns)))
+
+    return df.style.apply(
+        lambda _df: pd.DataFrame(styles, index=_df.index, columns=_df.columns),
+        axis=None,
     )
-    try:
-        styler = styler.hide(axis="index")
-    except Exception:
-        pass
-    return styler
 
 
 # ---------------------------------------------------------------------------
@@ -120,25 +216,29 @@ def maybe_send_notifications(
         return
 
     targets = {x.strip().lower() for x in alert_locations if x.strip()}
-    parsed = df["ParsedDateTime"]
-    match_mask = df["Location"].astype(str).str.strip().str.lower().isin(targets)
-    early_mask = match_mask & parsed.notna() & (parsed.dt.date < cutoff_date)
-    early_rows = df.loc[early_mask, ["Location", "Next Available", "Map Link"]].to_dict("records")
-
-    if not early_rows:
+    match_mask = df["Location"].astype(str).str.strip().str.lower().isin(targets).to_numpy()
+    # NaT compares False, so unknown dates are never early
+    early_mask = match_mask & (df["ParsedDateTime"].to_numpy() < np.datetime64(cutoff_date))
+    if not early_mask.any():
         return
 
+    early_rows = list(
+        zip(
+            df["Location"].to_numpy()[early_mask],
+            df["Next Available"].to_numpy()[early_mask],
+            df["Map Link"].to_numpy()[early_mask],
+        )
+    )
+
     state = load_state()
     new_rows = filter_new_earliest(early_rows, state)
     if not new_rows:
         return
 
-    body = prepare_notification_body(new_rows, cutoff_date, APPOINTMENT_PAGE_URL)
     try:
-        asyncio.run(send_email("Earlier Appointment Found", body))
-        for r in new_rows:
-            state[r["Location"]] = r["Next Available"]
-        save_state(state)
+        run_coro(notify_all(new_rows, cutoff_date, APPOINTMENT_PAGE_URL))
+        save_state({location: next_available for location, next_available, _ in new_rows})
+        flush_state()
         st.success(f"📧 Sent email for {len(new_rows)} new earlier appointment(s).")
     except Exception as e:
         st.error(f"Email failed: {e}")
@@ -173,41 +273,46 @@ def main():
         st.session_state.send_email_enabled = True
 
     # Get (cached) data early for sidebar population
-    rows = load_appointments_cached()
-    if not rows:
+    scraped = load_appointments_cached()
+    if scraped is None or scraped.empty:
         st.warning("No appointments found right now.")
         return
 
-    temp_df = pd.DataFrame(rows)
-    all_locations = sorted(temp_df["Location"].unique()) if not temp_df.empty else []
+    df, appt_dates, all_locations, display_df = build_display_frame(scraped)
 
-    # Sidebar
+    # Sidebar (widgets live in a form so the app only reruns on "Apply")
     with st.sidebar:
         st.header("E-mail Alerts")
 
-        cutoff = st.date_input(
-            "Cutoff date:",
-            APP_CONFIG.default_cutoff_date,
-            help="Highlight & watch for appointments strictly *before* this date.",
-        )
-
-        if APP_CONFIG.enable_email:
-            default_alert_selection = (
-                sorted(APP_CONFIG.target_dmvs) if APP_CONFIG.target_dmvs else all_locations
-            )
-            alert_locations = st.multiselect(
-                "E-mail me for these DMVs:",
-                options=all_locations,
-                default=default_alert_selection,
-                help="Only these locations can trigger emails.",
+        with st.form("alerts"):
+            cutoff = st.date_input(
+                "Cutoff date:",
+                APP_CONFIG.default_cutoff_date,
+                help="Highlight & watch for appointments strictly *before* this date.",
             )
 
-            st.session_state.send_email_enabled = st.checkbox(
-                "Send e-mail notification",
-                value=st.session_state.send_email_enabled,
-                help="Turn automatic alert emails on or off.",
-            )
+            if APP_CONFIG.enable_email:
+                default_alert_selection = (
+                    sorted(APP_CONFIG.target_dmvs) if APP_CONFIG.target_dmvs else list(all_locations)
+                )
+                alert_locations = st.multiselect(
+                    "E-mail me for these DMVs:",
+                    options=all_locations,
+                    default=default_alert_selection,
+                    help="Only these locations can trigger emails.",
+                )
+
+                st.session_state.send_email_enabled = st.checkbox(
+                    "Send e-mail notification",
+                    value=st.session_state.send_email_enabled,
+                    help="Turn automatic alert emails on or off.",
+                )
+            else:
+                alert_locations = []
 
+            st.form_submit_button("Apply")
+
+        if APP_CONFIG.enable_email:
             with st.expander("How e-mail alerts work"):
                 st.markdown(
                     """
@@ -215,40 +320,29 @@ def main():
 - Emails are only sent for DMVs you select.
 - You get an email only when a **new earlier** time appears (per DMV).
 - Turn the toggle off to pause emails any time.
+- Changes take effect when you press **Apply**.
                     """
                 )
         else:
-            alert_locations = []
             st.info("Email alerts are disabled in configuration (ENABLE_EMAIL=0).")
 
-    # Build final DataFrame for display
-    df = pd.DataFrame(rows)
-    parsed = pd.to_datetime(df["Next Available"], format=DATE_FORMAT, errors="coerce")
-    df = (
-        df.assign(ParsedDateTime=parsed)
-        .sort_values("ParsedDateTime", kind="stable")
-        .reset_index(drop=True)
-    )
-
     # Highlight mask
-    early_mask_display = df["ParsedDateTime"].notna() & (df["ParsedDateTime"].dt.date < cutoff)
-    display_df = df[["Location", "Next Available", "Map Link"]].copy()
-
-    # Make Map Link clickable
-    def to_anchor(val: str) -> str:
-        if isinstance(val, str) and val.startswith("http"):
-            return f'<a href="{val}" target="_blank">Map</a>'
-        return val
-
-    display_df["Map Link"] = display_df["Map Link"].map(to_anchor)
-    display_df.columns = ['Location', 'Next Available', 'Directions']
+    early_mask_display = df["ParsedDateTime"].notna() & (appt_dates < cutoff)
 
     st.success(f"Showing {len(display_df)} DMV locations.")
 
-    # Render highlighted table (escape=False so links work)
-    styler = build_highlight_styler(display_df, early_mask_display)
+    # Native Arrow-backed table; Styler only when something is highlighted.
     st.markdown("### 📅 Appointments")
-    st.markdown(styler.to_html(escape=False), unsafe_allow_html=True)
+    st.dataframe(
+        build_highlight_styler(display_df, early_mask_display)
+        if early_mask_display.any()
+        else display_df,
+        column_config={
+            "Directions": st.column_config.LinkColumn("Directions", display_text="Map"),
+        },
+        hide_index=True,
+        use_container_width=True,
+    )
 
     # Email notifications (only if config + toggle + selection)
     maybe_send_notifications(
@@ -273,7 +367,7 @@ def main():
     )
 
     st.markdown(
-        f"<small>Next refresh in about {REFRESH_MINUTES} minute(s). Adjust the cutoff date or alert DMVs any time.</small>",
+        f"<small>Next refresh in about {REFRESH_MINUTES} minute(s). Adjust the cutoff date or alert DMVs any time, then press Apply.</small>",
         unsafe_allow_html=True,
     )
 
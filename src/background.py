@@ -0,0 +1,118 @@
+"""
+background.py
+=============
+
+Process-wide background workers for the Streamlit app.
+
+Streamlit re-executes app.py on every rerun, and "Clear cache" wipes
+st.cache_resource, so the shared event loop (which owns the Chromium browser
+and SMTP connection) and the appointment refresher thread live here as
+module-level singletons. Imported modules are not re-executed on rerun.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import time
+from typing import Callable, Optional
+
+import pandas as pd
+
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_REFRESHER: Optional["AppointmentRefresher"] = None
+_LOCK = threading.Lock()
+
+
+# --------------------------------------------------------------------------------------
+# Shared event loop
+# --------------------------------------------------------------------------------------
+def get_loop() -> asyncio.AbstractEventLoop:
+    """
+    One long-lived event loop per process, running in a daemon thread.
+
+    The shared browser and SMTP connection are bound to this loop, so every
+    coroutine (scrape or email) must be submitted through `run_coro`.
+    Uses uvloop when installed (never on Windows, which keeps the Proactor loop;
+    set the event loop policy before the first call).
+    """
+    global _LOOP
+    with _LOCK:
+        if _LOOP is None:
+            loop = None
+            if not sys.platform.startswith("win"):
+                try:
+                    import uvloop
+
+                    loop = uvloop.new_event_loop()
+                except ImportError:
+                    pass
+            if loop is None:
+                loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="asyncio-loop", daemon=True).start()
+            _LOOP = loop
+        return _LOOP
+
+
+def run_coro(coro):
+    """
+    Run a coroutine on the shared background loop and block for its result.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, get_loop()).result()
+
+
+# --------------------------------------------------------------------------------------
+# Appointment refresher
+# --------------------------------------------------------------------------------------
+class AppointmentRefresher(threading.Thread):
+    """
+    Daemon thread that refreshes the appointment snapshot every `interval_secs`.
+
+    The request path reads `latest()` and never waits on a scrape, except for
+    the very first one after startup (stale-while-revalidate). A failed
+    (empty) scrape keeps the last good snapshot.
+    """
+
+    def __init__(self, load: Callable[[], pd.DataFrame], interval_secs: int):
+        super().__init__(name="appointment-refresher", daemon=True)
+        self._load = load
+        self._interval_secs = interval_secs
+        self._lock = threading.Lock()
+        self._latest: Optional[pd.DataFrame] = None
+        self.ready = threading.Event()
+
+    def run(self):
+        while True:
+            try:
+                df = self._load()
+                if not df.empty:
+                    with self._lock:
+                        self._latest = df
+            except Exception as e:
+                print(f"[refresher] Error: {e}")
+            finally:
+                self.ready.set()
+            time.sleep(self._interval_secs)
+
+    def latest(self) -> Optional[pd.DataFrame]:
+        with self._lock:
+            return self._latest
+
+
+def get_refresher(
+    load: Callable[[], pd.DataFrame], interval_secs: int
+) -> AppointmentRefresher:
+    """
+    Start the background refresher once per process and return it.
+
+    Args:
+        load: Returns a fresh appointment DataFrame (used only on first call).
+        interval_secs: Seconds between refreshes (used only on first call).
+    """
+    global _REFRESHER
+    with _LOCK:
+        if _REFRESHER is None:
+            _REFRESHER = AppointmentRefresher(load, interval_secs)
+            _REFRESHER.start()
+        return _REFRESHER
@@ -12,7 +12,7 @@ import yaml
 from pathlib import Path
 from datetime import datetime, date
 from dataclasses import dataclass, field
-from typing import List, Set, Any
+from typing import Any, List, Optional, Set, Tuple
 
 # Load .env early (NEW)
 try:
@@ -25,6 +25,8 @@ except Exception:
 ROOT = Path(__file__).resolve().parents[1]
 CONFIG_FILE = ROOT / "config" / "settings.yaml"
 DATE_FMT = "%Y-%m-%d"
+# Human-readable appointment time (UI table and emails); data itself is ISO-8601
+DISPLAY_DATETIME_FMT = "%Y-%m-%d %I:%M %p"
 
 
 @dataclass
@@ -48,10 +50,19 @@ class EmailConfig:
     use_tls: bool = True
     use_starttls: bool = False
     subject_prefix: str = "[NJ MVC]"
+    _recipients: Optional[Tuple[str, ...]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def recipients(self) -> Tuple[str, ...]:
+        # Resolved once; call clear_recipients_cache() after changing to_addrs/from_addr.
+        if self._recipients is None:
+            base = self.to_addrs or ([self.from_addr] if self.from_addr else [])
+            self._recipients = tuple(r for r in base if r)
+        return self._recipients
 
-    def recipients(self) -> List[str]:
-        base = self.to_addrs or ([self.from_addr] if self.from_addr else [])
-        return [r for r in base if r]
+    def clear_recipients_cache(self) -> None:
+        self._recipients = None
 
 
 def _bool_env(name: str, default: bool) -> bool:
@@ -173,3 +184,5 @@ APP_CONFIG, EMAIL_CONFIG = load_config()
 STATE_DIR = ROOT / "state"
 STATE_DIR.mkdir(exist_ok=True, parents=True)
 NOTIFICATION_STATE_FILE = STATE_DIR / "notification_state.json"
+APPOINTMENTS_CACHE_FILE = STATE_DIR / "appointments.pkl"
+APPOINTMENTS_LOCK_FILE = STATE_DIR / "appointments.lock"
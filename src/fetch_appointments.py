@@ -11,7 +11,7 @@ Key Features
    to skip installation.
 2. **Async Scraping with Playwright**: Collects all location cards and extracts:
       - Location name (city / site – first line of the header block)
-      - Next available appointment (converted to uniform format "%Y-%m-%d %I:%M %p")
+      - Next available appointment (converted to ISO-8601 "%Y-%m-%dT%H:%M:%S")
       - Google Maps link (if present in the card)
 3. **Filtering**: Optional list of `target_locations` (case‑insensitive). When provided,
    only cards whose *location name* contains (substring match) any of those target
@@ -19,27 +19,38 @@ Key Features
 4. **Graceful Error Handling**: Skips cards with unexpected structure and logs parse
    errors without aborting the entire run.
 5. **Configurability**: `headless`, `timeout_ms`, and `nav_timeout_ms` parameters.
+6. **Browser Reuse**: One Chromium instance and browser context are created
+   lazily and kept warm across scrapes; each scrape only opens (and closes) a
+   page. Await `shutdown()` before the owning loop closes; the exit hook only
+   covers loops still open at interpreter exit (e.g. the app's background loop).
 
 Return Value
 ------------
-A list of dictionaries (one per location) with keys:
-    {
-        "Location": <str>,
-        "Next Available": <formatted date str OR "Unknown">,
-        "Map Link": <str or "">
-    }
-
-The “Next Available” is formatted as: YYYY-MM-DD HH:MM AM/PM (12‑hour), or "Unknown"
-if the text cannot be parsed.
+A pandas DataFrame (one row per location per page) with columns:
+    "Location"        <str>
+    "Next Available"  <formatted date str OR "Unknown">
+    "Map Link"        <str or "">
+    "Source"          <page URL the card was scraped from>
+    "ParsedDateTime"  <datetime64 / NaT>
+
+The “Next Available” is formatted as ISO-8601: YYYY-MM-DDTHH:MM:SS (24‑hour), or
+"Unknown" if the text cannot be parsed, so consumers can use datetime.fromisoformat.
+`ParsedDateTime` is the same value as a timestamp (NaT when unknown) so callers
+never need to re-parse the string.
 
 Usage Example
 -------------
     import asyncio
-    from fetch_appointments import fetch_appointments
+    from fetch_appointments import fetch_appointments, shutdown
 
-    rows = asyncio.run(fetch_appointments())
-    for r in rows:
-        print(r)
+    async def main():
+        try:
+            return await fetch_appointments()
+        finally:
+            await shutdown()
+
+    df = asyncio.run(main())
+    print(df)
 
 Integration Notes
 -----------------
@@ -53,14 +64,15 @@ Integration Notes
 from __future__ import annotations
 
 import asyncio
+import atexit
 import re
 import subprocess
 import sys
 import threading
-from datetime import datetime
 from pathlib import Path
-from typing import Iterable, List, Optional, Sequence
+from typing import Iterable, List, Optional, Pattern, Sequence
 
+import pandas as pd
 from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from playwright.async_api import async_playwright
 
@@ -69,23 +81,73 @@ from playwright.async_api import async_playwright
 # ------------------------------------------------------------------------------
 APPOINTMENT_URL = "https://telegov.njportal.com/njmvc/AppointmentWizard/11"
 DATE_PARSE_INPUT = "%m/%d/%Y %I:%M %p"
-DATE_OUTPUT_FORMAT = "%Y-%m-%d %I:%M %p"
+DATE_OUTPUT_FORMAT = "%Y-%m-%dT%H:%M:%S"  # ISO-8601
+RESULT_COLUMNS = ["Location", "Next Available", "Map Link", "Source"]
 
 # CSS selectors (tuned to current site structure; adjust if site changes)
-CARD_SELECTOR = "div.locationCard"
-HEADER_SELECTOR = ".AppointcardHeader"
+# Union of the known card class names, so one wait covers either markup
+CARD_SELECTOR = "div.locationCard, div.cardlocationcard"
+HEADER_SELECTOR = ".AppointcardHeader, .appointmentcardheader"
 FOOTER_POSSIBLE = [
     "#cardFooter",          # (Observed id reused inside cards)
     ".cardFooter",
+    ".cardfooter",
     ".footer",
 ]
-# Pattern to detect the “Next Available:” text line
+MAP_LINK_SELECTOR = 'a[href*="maps.google"], a[href*="google.com/maps"]'
+
+# Walks every card in-page and returns [{location, footer, map}, ...] in one call.
+# Footer is the first non-empty match among the FOOTER_POSSIBLE selectors.
+CARD_EXTRACT_JS = """
+(sel) => Array.from(document.querySelectorAll(sel.card)).map((card) => {
+    const header = card.querySelector(sel.header);
+    let footer = "";
+    for (const fs of sel.footers) {
+        const el = card.querySelector(fs);
+        const text = el ? (el.innerText || "").trim() : "";
+        if (text) { footer = text; break; }
+    }
+    const link = card.querySelector(sel.mapLink);
+    return {
+        location: header ? (header.innerText || "") : "",
+        footer: footer,
+        map: link ? (link.getAttribute("href") || "") : "",
+    };
+})
+"""
+
+# Chromium flags for container / server environments
+CHROMIUM_ARGS = [
+    "--disable-dev-shm-usage",
+    "--no-sandbox",
+    "--disable-gpu",
+    "--disable-extensions",
+]
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36"
+)
+
+# Request types aborted during scraping (never needed to read card text).
+# "other" covers favicons, manifests, beacons and similar; XHR/fetch are kept.
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "stylesheet", "media", "other"})
+
+# Label / pattern to detect the “Next Available:” text line
+NEXT_AVAILABLE_LABEL = "Next Available:"
 NEXT_AVAILABLE_PATTERN = re.compile(r"Next\s+Available:\s*(.+)", re.IGNORECASE)
 
 # Lazy install marker
 _PLAYWRIGHT_MARKER = Path(".playwright_installed")
 _INSTALL_LOCK = threading.Lock()
 
+# Shared browser/context (launched once, reused across scrapes; see _get_context)
+_PW = None
+_BROWSER = None
+_CONTEXT = None
+_BROWSER_HEADLESS: Optional[bool] = None
+_BROWSER_LOCK: Optional[asyncio.Lock] = None
+_BROWSER_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
 
 # ------------------------------------------------------------------------------
 # Playwright Lazy Installation
@@ -131,106 +193,261 @@ def ensure_playwright_installed() -> None:
             raise RuntimeError(f"Failed to install Playwright Chromium: {e}") from e
 
 
+# ------------------------------------------------------------------------------
+# Shared Browser
+# ------------------------------------------------------------------------------
+async def _get_context(headless: bool):
+    """
+    Return the shared browser context, launching Chromium on first use.
+
+    - Playwright objects are bound to the event loop that created them, so a
+      call from a different loop starts a fresh browser.
+    - Relaunches if the browser disconnected or `headless` changed.
+    - Guarded by an asyncio.Lock so concurrent scrapes launch only once.
+
+    Args:
+        headless: Whether to run Chromium headless.
+
+    Returns:
+        A BrowserContext on a connected Chromium; callers open their own pages.
+    """
+    global _PW, _BROWSER, _CONTEXT, _BROWSER_HEADLESS, _BROWSER_LOCK, _BROWSER_LOOP
+
+    loop = asyncio.get_running_loop()
+    if _BROWSER_LOOP is not loop:
+        _PW = _BROWSER = _CONTEXT = None
+        _BROWSER_LOCK = asyncio.Lock()
+        _BROWSER_LOOP = loop
+
+    async with _BROWSER_LOCK:
+        if _BROWSER is not None and (
+            _BROWSER_HEADLESS != headless or not _BROWSER.is_connected()
+        ):
+            await shutdown()
+        if _CONTEXT is None:
+            if _PW is None:
+                _PW = await async_playwright().start()
+            _BROWSER = await _PW.chromium.launch(headless=headless, args=CHROMIUM_ARGS)
+            _BROWSER_HEADLESS = headless
+            _CONTEXT = await _BROWSER.new_context(
+                java_script_enabled=True, user_agent=USER_AGENT
+            )
+            # Only the card DOM is needed; skip images/fonts/CSS/media downloads
+            await _CONTEXT.route("**/*", _abort_heavy)
+        return _CONTEXT
+
+
+async def shutdown() -> None:
+    """
+    Close the shared context and browser and stop Playwright (best effort, idempotent).
+    """
+    global _PW, _BROWSER, _CONTEXT
+    context, browser, pw = _CONTEXT, _BROWSER, _PW
+    _CONTEXT = _BROWSER = _PW = None
+    if context is not None:
+        try:
+            await context.close()
+        except Exception:
+            pass
+    if browser is not None:
+        try:
+            await browser.close()
+        except Exception:
+            pass
+    if pw is not None:
+        try:
+            await pw.stop()
+        except Exception:
+            pass
+
+
+def _shutdown_at_exit() -> None:
+    """
+    atexit hook: shut the shared browser down on the loop that owns it.
+    """
+    loop = _BROWSER_LOOP
+    if _BROWSER is None or loop is None or loop.is_closed():
+        return
+    try:
+        if loop.is_running():
+            # Loop runs in another thread (e.g. the app's background loop)
+            asyncio.run_coroutine_threadsafe(shutdown(), loop).result(timeout=5)
+        else:
+            loop.run_until_complete(shutdown())
+    except Exception:
+        pass
+
+
+atexit.register(_shutdown_at_exit)
+
+
 # ------------------------------------------------------------------------------
 # Utility Functions
 # ------------------------------------------------------------------------------
-def _matches_target(location_name: str, target_locations: Optional[Sequence[str]]) -> bool:
+def _compile_targets(target_locations: Optional[Sequence[str]]) -> Optional[Pattern[str]]:
     """
-    Case-insensitive substring match for any target token in location_name.
+    Compile target tokens into one case-insensitive alternation regex.
 
     Args:
-        location_name: The card's extracted location name (e.g., "Bayonne").
         target_locations: Optional list of substrings to filter by.
 
     Returns:
-        True if no targets provided (include all), or one of the targets
-        is a substring of the location name (case-insensitive).
+        Compiled pattern matching any target as a substring, or None if no
+        (non-blank) targets were provided (include all).
     """
     if not target_locations:
-        return True
-    low = location_name.lower()
-    return any(t.lower() in low for t in target_locations if t.strip())
+        return None
+    tokens = [re.escape(t.strip()) for t in target_locations if t.strip()]
+    if not tokens:
+        return None
+    return re.compile("|".join(tokens), re.IGNORECASE)
 
 
-def _extract_next_available(text_block: str) -> Optional[datetime]:
+async def _abort_heavy(route) -> None:
     """
-    Extract the next available datetime from a text block.
+    Route handler: abort requests for BLOCKED_RESOURCE_TYPES, continue the rest.
+
+    Args:
+        route: Playwright Route for an outgoing request.
+    """
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+def _extract_next_available(text_block: str) -> Optional[str]:
+    """
+    Extract the raw next-available date text from a text block.
 
     Args:
         text_block: Footer or full card text containing 'Next Available:' line.
 
     Returns:
-        Parsed datetime object or None if parsing fails.
+        Raw date text (e.g. "08/14/2025 10:30 AM") or None if not present.
+        Parsing happens later, in bulk, in `_to_frame`.
 
     Side note:
         We split after 'Next Available:' and take the first line segment.
+        The exact label is located with str.find (fast path); the regex only
+        runs for variant spacing/casing.
     """
-    match = NEXT_AVAILABLE_PATTERN.search(text_block)
-    if not match:
-        return None
-    raw = match.group(1).strip().splitlines()[0].strip()
-    try:
-        return datetime.strptime(raw, DATE_PARSE_INPUT)
-    except Exception:
-        return None
+    idx = text_block.find(NEXT_AVAILABLE_LABEL)
+    if idx >= 0:
+        tail = text_block[idx + len(NEXT_AVAILABLE_LABEL):].lstrip()
+    else:
+        match = NEXT_AVAILABLE_PATTERN.search(text_block)
+        if not match:
+            return None
+        tail = match.group(1).strip()
+    nl = tail.find("\n")
+    return (tail[:nl] if nl >= 0 else tail).strip()
 
 
-async def _extract_card_data(card) -> dict:
+def _build_card_row(raw: dict) -> dict:
     """
-    Extract structured data from a single card element.
+    Turn one raw card payload (from CARD_EXTRACT_JS) into a result row.
 
     Args:
-        card: Playwright element handle for a location card.
+        raw: dict with keys location (header text), footer (footer text), map (href).
 
     Returns:
-        dict with keys: Location, Next Available (formatted or 'Unknown'), Map Link (string).
+        dict with keys: Location, Raw Available (unparsed date text or None), Map Link (string).
     """
-    # Header / Location name
-    location_name = "Unknown"
-    try:
-        header_el = await card.query_selector(HEADER_SELECTOR)
-        if header_el:
-            header_text = (await header_el.inner_text()).strip()
-            # Card header often has multiple lines; location name usually first line
-            location_name = header_text.splitlines()[0].strip()
-    except Exception:
-        pass
+    # Card header often has multiple lines; location name usually first line
+    header_text = (raw.get("location") or "").strip()
+    location_name = header_text.splitlines()[0].strip() if header_text else "Unknown"
 
-    # Footer text (for Next Available)
-    footer_text = ""
-    for sel in FOOTER_POSSIBLE:
-        try:
-            el = await card.query_selector(sel)
-            if el:
-                footer_text = (await el.inner_text()).strip()
-                if footer_text:
-                    break
-        except Exception:
-            continue
+    return {
+        "Location": location_name,
+        "Raw Available": _extract_next_available(raw.get("footer") or ""),
+        "Map Link": raw.get("map") or "",
+    }
 
-    # Parse date
-    appt_dt = _extract_next_available(footer_text)
-    if appt_dt:
-        appt_str = appt_dt.strftime(DATE_OUTPUT_FORMAT)
-    else:
-        appt_str = "Unknown"
 
-    # Map Link detection
-    map_link = ""
+def _to_frame(rows: List[dict]) -> pd.DataFrame:
+    """
+    Build the result DataFrame once, parsing all raw dates in one vectorized call.
+
+    Args:
+        rows: Card dicts from `_scrape_one` (Location, Raw Available, Map Link, Source).
+
+    Returns:
+        DataFrame with RESULT_COLUMNS plus "ParsedDateTime".
+    """
+    df = pd.DataFrame(rows, columns=["Location", "Raw Available", "Map Link", "Source"])
+    parsed = pd.to_datetime(df.pop("Raw Available"), format=DATE_PARSE_INPUT, errors="coerce")
+    df.insert(1, "Next Available", parsed.dt.strftime(DATE_OUTPUT_FORMAT).fillna("Unknown"))
+    df["ParsedDateTime"] = parsed
+    return df
+
+
+async def _scrape_one(
+    context,
+    url: str,
+    target_re: Optional[Pattern[str]],
+    timeout_ms: int,
+    nav_timeout_ms: int,
+) -> List[dict]:
+    """
+    Scrape one appointment page in its own tab of the shared context.
+
+    Args:
+        context: Shared BrowserContext (see `_get_context`).
+        url: Appointment wizard page to load.
+        target_re: Compiled target filter, or None to keep every card.
+        timeout_ms: Timeout for waiting on the card selector.
+        nav_timeout_ms: Navigation timeout for page.goto.
+
+    Returns:
+        Card rows from `_build_card_row`, each tagged with "Source": url
+        (empty on timeout or error).
+    """
+    rows: List[dict] = []
     try:
-        link_el = await card.query_selector('a[href*="maps.google"]')
-        if link_el:
-            href = await link_el.get_attribute("href")
-            if href:
-                map_link = href
-    except Exception:
-        pass
+        page = await context.new_page()
+        try:
+            page.set_default_navigation_timeout(nav_timeout_ms)
+            page.set_default_timeout(timeout_ms)
 
-    return {
-        "Location": location_name,
-        "Next Available": appt_str,
-        "Map Link": map_link,
-    }
+            # Don't wait for subresources; wait_for_selector below gates on the cards
+            await page.goto(url, wait_until="domcontentloaded")
+
+            # Wait for location cards
+            try:
+                await page.wait_for_selector(CARD_SELECTOR, timeout=timeout_ms)
+            except PlaywrightTimeoutError:
+                return rows  # empty if structure not found
+
+            # One in-browser DOM walk for all cards instead of per-card round-trips
+            raw_cards = await page.evaluate(
+                CARD_EXTRACT_JS,
+                {
+                    "card": CARD_SELECTOR,
+                    "header": HEADER_SELECTOR,
+                    "footers": FOOTER_POSSIBLE,
+                    "mapLink": MAP_LINK_SELECTOR,
+                },
+            )
+
+            for raw in raw_cards:
+                try:
+                    info = _build_card_row(raw)
+                    if target_re is None or target_re.search(info["Location"]):
+                        info["Source"] = url
+                        rows.append(info)
+                except Exception:
+                    # Skip problematic card but continue
+                    continue
+        finally:
+            # Only the page is per-scrape; browser and context stay warm
+            await page.close()
+
+    except Exception as e:
+        # Log & return partial/no results for this page
+        print(f"[fetch_appointments] Error ({url}): {e}")
+
+    return rows
 
 
 # ------------------------------------------------------------------------------
@@ -241,9 +458,10 @@ async def fetch_appointments(
     headless: bool = True,
     timeout_ms: int = 25_000,
     nav_timeout_ms: int = 25_000,
-) -> List[dict]:
+    urls: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
     """
-    Scrape the NJ MVC appointment wizard page and collect appointment data.
+    Scrape the NJ MVC appointment wizard page(s) and collect appointment data.
 
     Args:
         target_locations:
@@ -257,12 +475,18 @@ async def fetch_appointments(
             Timeout (milliseconds) for waiting on the card selector to appear.
         nav_timeout_ms:
             Navigation timeout for page.goto (milliseconds).
+        urls:
+            Appointment pages to scrape (default: [APPOINTMENT_URL]). Each is
+            loaded concurrently in its own tab of the shared browser context.
 
     Returns:
-        A list of dictionaries with keys:
+        A DataFrame sorted by date (earliest slot per location on each page;
+        different services at the same location stay separate rows) with columns:
             - "Location"
-            - "Next Available" (formatted string YYYY-MM-DD HH:MM AM/PM or "Unknown")
+            - "Next Available" (ISO-8601 string YYYY-MM-DDTHH:MM:SS or "Unknown")
             - "Map Link" (Google Maps URL or "")
+            - "Source" (appointment page URL the row came from)
+            - "ParsedDateTime" (timestamp of "Next Available", NaT if unknown)
 
     Raises:
         RuntimeError: If Playwright installation fails.
@@ -279,82 +503,54 @@ async def fetch_appointments(
     results: List[dict] = []
 
     try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=headless)
-            context = await browser.new_context()
-            page = await context.new_page()
-            page.set_default_navigation_timeout(nav_timeout_ms)
-            page.set_default_timeout(timeout_ms)
-
-            await page.goto(APPOINTMENT_URL)
-
-            # Wait for location cards
-            try:
-                await page.wait_for_selector(CARD_SELECTOR, timeout=timeout_ms)
-            except PlaywrightTimeoutError:
-                await browser.close()
-                return results  # return empty list if structure not found
-
-            cards = await page.query_selector_all(CARD_SELECTOR)
-
-            for card in cards:
-                try:
-                    info = await _extract_card_data(card)
-                    if _matches_target(info["Location"], target_locations):
-                        results.append(info)
-                except Exception:
-                    # Skip problematic card but continue
-                    continue
-
-            await browser.close()
+        context = await _get_context(headless)
+        target_re = _compile_targets(target_locations)
+        per_page = await asyncio.gather(
+            *(
+                _scrape_one(context, url, target_re, timeout_ms, nav_timeout_ms)
+                for url in (urls or [APPOINTMENT_URL])
+            )
+        )
+        for rows in per_page:
+            results.extend(rows)
 
     except Exception as e:
         # Log & bubble up partial/no results if needed
         print(f"[fetch_appointments] Error: {e}")
 
-    # Deduplicate by Location keeping earliest date (if duplicates appear)
-    dedup: dict[str, dict] = {}
-    for r in results:
-        key = r["Location"]
-        existing = dedup.get(key)
-        if existing is None:
-            dedup[key] = r
-        else:
-            # Compare dates if both parseable
-            def parse_out(s: str):
-                try:
-                    return datetime.strptime(s, DATE_OUTPUT_FORMAT)
-                except Exception:
-                    return None
-
-            new_dt = parse_out(r["Next Available"])
-            old_dt = parse_out(existing["Next Available"])
-            if new_dt and (old_dt is None or new_dt < old_dt):
-                dedup[key] = r
-
-    # Return in sorted order by date if possible
-    def sort_key(item):
-        dt_str = item.get("Next Available", "")
-        try:
-            return datetime.strptime(dt_str, DATE_OUTPUT_FORMAT)
-        except Exception:
-            # Unknown dates go last
-            return datetime.max
-
-    sorted_results = sorted(dedup.values(), key=sort_key)
-    return sorted_results
+    # Deduplicate per (page, Location) keeping the earliest date; unknown dates go last
+    return (
+        _to_frame(results)
+        .sort_values("ParsedDateTime", na_position="last", kind="stable")
+        .drop_duplicates(subset=["Source", "Location"], keep="first")
+        .reset_index(drop=True)
+    )
 
 
 # ------------------------------------------------------------------------------
 # Stand-alone test runner
 # ------------------------------------------------------------------------------
 if __name__ == "__main__":
+    # libuv-backed loop for the CDP traffic (optional; not on Windows)
+    if not sys.platform.startswith("win"):
+        try:
+            import uvloop
+
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        except ImportError:
+            pass
+
+    async def _run():
+        # asyncio.run closes the loop before atexit hooks run, so shut down here
+        try:
+            return await fetch_appointments()
+        finally:
+            await shutdown()
+
     print("🚀 Running standalone fetch test...")
-    rows = asyncio.run(fetch_appointments())
-    if not rows:
+    df = asyncio.run(_run())
+    if df.empty:
         print("No data scraped (check selectors or connectivity).")
     else:
-        from pprint import pprint
-
-        pprint(rows)
-        print(f"\nTotal locations: {len(rows)}")
+        print(df.to_string(index=False))
+        print(f"\nTotal locations: {len(df)}")
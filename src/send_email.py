@@ -14,9 +14,12 @@ State File
 ----------
 state/notification_state.json stores:
     {
-      "Location Name": "YYYY-MM-DD HH:MM AM/PM",
+      "Location Name": {"str": "2025-08-14T10:30:00", "epoch": 1755167400},
       ...
     }
+"epoch" lets comparisons skip date parsing; it is "str" read as UTC, so the
+file means the same thing on hosts in any timezone. Older files with plain string
+values are still read (parsed once) and rewritten in the new shape on save.
 Delete this file to reset duplicate suppression.
 
 Security
@@ -28,10 +31,13 @@ Security
 Quick Usage (Programmatic)
 --------------------------
     import asyncio
-    from send_email import send_email
+    from send_email import close_smtp, send_email
 
     async def demo():
-        await send_email("Test Subject", "This is only a test.")
+        try:
+            await send_email("Test Subject", "This is only a test.")
+        finally:
+            await close_smtp()  # send QUIT before asyncio.run closes the loop
 
     asyncio.run(demo())
 
@@ -48,52 +54,301 @@ Add --dry-run to preview without sending:
 
 from __future__ import annotations
 
+import asyncio
+import atexit
+import calendar
+import itertools
 import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
 import argparse
-from email.message import EmailMessage
+from email.header import Header
 from datetime import datetime
-from typing import Dict, List
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 import aiosmtplib
 
-from config import EMAIL_CONFIG, NOTIFICATION_STATE_FILE
+# Optional faster JSON decoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from config import DISPLAY_DATETIME_FMT, EMAIL_CONFIG, NOTIFICATION_STATE_FILE
+
+# (Location, Next Available, Map Link)
+AppointmentRow = Tuple[str, str, str]
+# {"str": "YYYY-MM-DDTHH:MM:SS", "epoch": int | None}, or a legacy plain string
+StateEntry = Union[str, Dict[str, Any]]
+
+# Legacy "%Y-%m-%d %I:%M %p" (e.g. "2025-08-14 10:30 AM"); parsed by hand, see _parse_state_date
+_STATE_DATE_RE = re.compile(
+    r"(\d{4})-(\d{1,2})-(\d{1,2})\s+(\d{1,2}):(\d{2})\s*([AP]M)$", re.IGNORECASE
+)
 
 
 # --------------------------------------------------------------------------------------
 # State Management
 # --------------------------------------------------------------------------------------
-def load_state() -> Dict[str, str]:
-    """
-    Load previously recorded earliest appointment times per location.
+_STATE: Optional[Dict[str, StateEntry]] = None
+_STATE_MTIME: Optional[float] = None  # file mtime when _STATE was read / flushed
+_STATE_DIRTY = False
+_STATE_LOCK = threading.Lock()
 
-    Returns:
-        Dict mapping location -> earliest notified timestamp (string).
-    """
+
+def _state_file_mtime() -> Optional[float]:
+    try:
+        return NOTIFICATION_STATE_FILE.stat().st_mtime
+    except OSError:
+        return None
+
+
+def _read_state_file() -> Dict[str, StateEntry]:
     if NOTIFICATION_STATE_FILE.exists():
         try:
+            if orjson is not None:
+                return orjson.loads(NOTIFICATION_STATE_FILE.read_bytes())
             return json.loads(NOTIFICATION_STATE_FILE.read_text(encoding="utf-8"))
         except Exception:
             return {}
     return {}
 
 
-def save_state(state: Dict[str, str]) -> None:
+def load_state() -> Dict[str, StateEntry]:
+    """
+    Load previously recorded earliest appointment times per location.
+
+    The state is kept in memory; the file is only re-read when another
+    process has replaced it (mtime changed) and there are no unflushed
+    local changes.
+
+    Returns:
+        Snapshot (a copy) mapping location -> {"str": timestamp string,
+        "epoch": int or None} (legacy files may still hold plain timestamp
+        strings). Record changes with `save_state`, not by mutating it.
+    """
+    with _STATE_LOCK:
+        return dict(_current_state())
+
+
+def _current_state() -> Dict[str, StateEntry]:
+    """
+    The live in-memory state, (re)read from disk when needed. Caller must hold _STATE_LOCK.
     """
-    Persist notification state to disk (best effort).
+    global _STATE, _STATE_MTIME
+    mtime = _state_file_mtime()
+    if _STATE is None or (not _STATE_DIRTY and mtime != _STATE_MTIME):
+        _STATE = _read_state_file()
+        _STATE_MTIME = mtime
+    return _STATE
+
+
+def save_state(updates: Dict[str, StateEntry]) -> None:
+    """
+    Merge this cycle's notified times into the in-memory state; `flush_state` writes it.
 
     Args:
-        state: Updated mapping.
+        updates: location -> newly notified timestamp string. Plain string
+            values are stored as {"str", "epoch"} entries on flush.
     """
-    try:
-        NOTIFICATION_STATE_FILE.write_text(
-            json.dumps(state, indent=2), encoding="utf-8"
-        )
-    except Exception:
-        pass  # Ignore write errors silently.
+    global _STATE_DIRTY
+    with _STATE_LOCK:
+        _current_state().update(updates)
+        _STATE_DIRTY = True
+
+
+def flush_state() -> None:
+    """
+    Persist in-memory notification state to disk if it changed (best effort).
+    Call once per poll cycle; also registered to run at interpreter exit.
+    """
+    global _STATE, _STATE_DIRTY, _STATE_MTIME
+    with _STATE_LOCK:
+        if not _STATE_DIRTY or _STATE is None:
+            return
+        # Write to a uniquely named temp file then rename, so a concurrent reader,
+        # another process flushing at the same time, or a crash never sees (or
+        # installs) a half-written state file.
+        tmp = None
+        try:
+            normalized = {
+                loc: entry if isinstance(entry, dict) else {"str": entry, "epoch": _state_epoch(entry)}
+                for loc, entry in _STATE.items()
+            }
+            with tempfile.NamedTemporaryFile(
+                "w",
+                encoding="utf-8",
+                dir=NOTIFICATION_STATE_FILE.parent,
+                prefix=f"{NOTIFICATION_STATE_FILE.stem}.",
+                suffix=".tmp",
+                delete=False,
+            ) as fh:
+                tmp = fh.name
+                fh.write(json.dumps(normalized, separators=(",", ":")))
+            os.replace(tmp, NOTIFICATION_STATE_FILE)
+            # Keep memory in the same shape as disk so later cycles skip re-parsing
+            _STATE = normalized
+            _STATE_MTIME = _state_file_mtime()
+            _STATE_DIRTY = False
+        except Exception:
+            # Ignore write errors silently, but don't leave the temp file behind.
+            if tmp is not None:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+
+
+atexit.register(flush_state)
+
+
+def _state_epoch(entry: Optional[StateEntry]) -> Optional[int]:
+    """
+    Epoch seconds for a state entry, parsing only legacy string values.
+
+    Args:
+        entry: {"str", "epoch"} dict, legacy timestamp string, or None.
+
+    Returns:
+        Integer epoch, or None if missing / unparsable. Naive times are read
+        as UTC, so stored epochs don't depend on the writing host's timezone.
+    """
+    if entry is None:
+        return None
+    if isinstance(entry, dict):
+        return entry.get("epoch")
+    dt = _parse_state_date(entry)
+    return calendar.timegm(dt.timetuple()) if dt else None
+
+
+# --------------------------------------------------------------------------------------
+# SMTP Connection (kept open and reused across sends)
+# --------------------------------------------------------------------------------------
+SMTP_IDLE_SECS = 60  # reconnect instead of reusing a connection idle this long
+
+_SMTP_CLIENT: Optional[aiosmtplib.SMTP] = None
+_SMTP_EXPIRES = 0.0  # time.monotonic() deadline for reusing _SMTP_CLIENT
+_SMTP_LOCK: Optional[asyncio.Lock] = None
+_SMTP_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+
+async def _connect_smtp() -> aiosmtplib.SMTP:
+    """
+    Open and authenticate a new SMTP connection from EMAIL_CONFIG.
+
+    Uses implicit TLS if EMAIL_USE_TLS=1 and STARTTLS disabled, otherwise
+    plain or STARTTLS.
+    """
+    cfg = EMAIL_CONFIG
+    implicit_tls = cfg.use_tls and not cfg.use_starttls
+    client = aiosmtplib.SMTP(
+        hostname=cfg.host,
+        port=cfg.port,
+        use_tls=implicit_tls,
+        # None = aiosmtplib default: upgrade if the server offers STARTTLS
+        start_tls=True if cfg.use_starttls else None,
+    )
+    await client.connect()
+    await client.login(cfg.user, cfg.password)
+    return client
+
+
+async def _get_smtp() -> aiosmtplib.SMTP:
+    """
+    Return the shared logged-in client, reconnecting if it is missing,
+    disconnected, or has been idle longer than SMTP_IDLE_SECS.
+    Caller must hold _SMTP_LOCK.
+    """
+    global _SMTP_CLIENT
+    if _SMTP_CLIENT is not None and (
+        not _SMTP_CLIENT.is_connected or time.monotonic() > _SMTP_EXPIRES
+    ):
+        await close_smtp()
+    if _SMTP_CLIENT is None:
+        _SMTP_CLIENT = await _connect_smtp()
+    return _SMTP_CLIENT
+
+
+async def _send_pooled(sender: str, recipients: Sequence[str], raw: bytes) -> None:
+    """
+    Send a prebuilt raw message on the shared connection, (re)connecting when needed.
+
+    The connection is bound to the event loop that opened it; a call from a
+    different loop opens a new one. A stale connection (server closed it while
+    idle) is replaced once and the send retried. Each successful send keeps
+    the connection warm for another SMTP_IDLE_SECS.
+    """
+    global _SMTP_CLIENT, _SMTP_EXPIRES, _SMTP_LOCK, _SMTP_LOOP
+
+    loop = asyncio.get_running_loop()
+    if _SMTP_LOOP is not loop:
+        _SMTP_CLIENT = None
+        _SMTP_LOCK = asyncio.Lock()
+        _SMTP_LOOP = loop
+
+    async with _SMTP_LOCK:
+        client = await _get_smtp()
+        try:
+            await client.sendmail(sender, recipients, raw)
+        except aiosmtplib.SMTPServerDisconnected:
+            await close_smtp()
+            client = await _get_smtp()
+            await client.sendmail(sender, recipients, raw)
+        _SMTP_EXPIRES = time.monotonic() + SMTP_IDLE_SECS
+
+
+async def close_smtp() -> None:
+    """
+    Close the shared SMTP connection, if any (best effort).
+    """
+    global _SMTP_CLIENT
+    client, _SMTP_CLIENT = _SMTP_CLIENT, None
+    if client is not None and client.is_connected:
+        try:
+            await client.quit()
+        except Exception:
+            pass
 
 
 # --------------------------------------------------------------------------------------
 # Email Sending
 # --------------------------------------------------------------------------------------
+def _build_raw_message(
+    from_addr: str, recipients: Sequence[str], subject: str, body: str
+) -> bytes:
+    """
+    Compose a plain-text UTF-8 message directly as bytes.
+
+    Skips EmailMessage / email.policy formatting, which is slow for long bodies.
+    Switch back to EmailMessage if HTML parts or attachments are ever needed.
+
+    Args:
+        from_addr: From header value.
+        recipients: To addresses.
+        subject: Full subject line (RFC 2047-encoded if not ASCII).
+        body: Plain text content.
+
+    Returns:
+        RFC 5322 message bytes with CRLF line endings.
+    """
+    if not subject.isascii():
+        subject = Header(subject, "utf-8").encode(linesep="\r\n")
+    crlf_body = body.replace("\r\n", "\n").replace("\n", "\r\n")
+    return (
+        f"From: {from_addr}\r\n"
+        f"To: {', '.join(recipients)}\r\n"
+        f"Subject: {subject}\r\n"
+        "MIME-Version: 1.0\r\n"
+        "Content-Type: text/plain; charset=utf-8\r\n"
+        "Content-Transfer-Encoding: 8bit\r\n"
+        "\r\n"
+        f"{crlf_body}\r\n"
+    ).encode("utf-8")
+
+
 async def send_email(subject: str, body: str) -> None:
     """
     Send a plain‑text email.
@@ -105,6 +360,9 @@ async def send_email(subject: str, body: str) -> None:
     Behavior:
         - Skips silently if credentials or recipients are missing.
         - Uses implicit TLS (port 465) if EMAIL_USE_TLS=1 and STARTTLS disabled.
+        - Reuses one open SMTP connection across calls (see `close_smtp`).
+        - Callers should batch: one message per poll cycle covering every new
+          alert (see `notify_all`), not one message per location.
     """
     cfg = EMAIL_CONFIG
     if not cfg.user or not cfg.password:
@@ -115,32 +373,10 @@ async def send_email(subject: str, body: str) -> None:
         print("[EMAIL] No recipients resolved; skipping.")
         return
 
-    msg = EmailMessage()
-    msg["From"] = cfg.from_addr
-    msg["To"] = ", ".join(recipients)
     full_subject = f"{cfg.subject_prefix} {subject}".strip()
-    msg["Subject"] = full_subject
-    msg.set_content(body)
-
-    if cfg.use_tls and not cfg.use_starttls:
-        # Implicit TLS (e.g. port 465)
-        await aiosmtplib.send(
-            msg,
-            hostname=cfg.host,
-            port=cfg.port,
-            username=cfg.user,
-            password=cfg.password,
-            use_tls=True,
-        )
-    else:
-        # Plain or STARTTLS
-        client = aiosmtplib.SMTP(hostname=cfg.host, port=cfg.port, use_tls=False)
-        await client.connect()
-        if cfg.use_starttls:
-            await client.starttls()
-        await client.login(cfg.user, cfg.password)
-        await client.send_message(msg)
-        await client.quit()
+    raw = _build_raw_message(cfg.from_addr, recipients, full_subject, body)
+
+    await _send_pooled(cfg.from_addr, recipients, raw)
 
     print(f"[EMAIL] Sent: {full_subject}")
 
@@ -148,54 +384,115 @@ async def send_email(subject: str, body: str) -> None:
 # --------------------------------------------------------------------------------------
 # Notification Content & Filtering
 # --------------------------------------------------------------------------------------
-def prepare_notification_body(rows: List[dict], cutoff_date, booking_url: str) -> str:
+def _parse_state_date(value: str) -> Optional[datetime]:
+    """
+    Parse a timestamp string without strptime.
+
+    Args:
+        value: ISO-8601 string as produced by the scraper, or a legacy
+            "YYYY-MM-DD HH:MM AM/PM" string from an older state file.
+
+    Returns:
+        datetime, or None if the string does not match or is out of range.
+    """
+    raw = value.strip()
+    # O(1) shape check first: rejects "Unknown" etc. without parsing
+    if not (14 <= len(raw) <= 22 and "-" in raw and ":" in raw):
+        return None
+    if raw[-1] not in "Mm":
+        try:
+            return datetime.fromisoformat(raw)
+        except ValueError:
+            return None
+    m = _STATE_DATE_RE.match(raw)
+    if not m:
+        return None
+    year, month, day, hour, minute, ampm = m.groups()
+    hour_24 = int(hour) % 12 + (12 if ampm.upper() == "PM" else 0)
+    try:
+        return datetime(int(year), int(month), int(day), hour_24, int(minute))
+    except ValueError:
+        return None
+
+
+def _display_date(value: str) -> str:
+    """
+    Human-readable form of a timestamp string for emails (unparsable values unchanged).
+    """
+    dt = _parse_state_date(value)
+    return dt.strftime(DISPLAY_DATETIME_FMT) if dt else value
+
+
+def prepare_notification_body(rows: List[AppointmentRow], cutoff_date, booking_url: str) -> str:
     """
     Build email body listing early appointments.
 
     Args:
-        rows: Appointment dicts (Location, Next Available, Map Link).
+        rows: (Location, Next Available, Map Link) tuples -- the *aggregated*
+            list for the current poll cycle, so one email covers all alerts.
         cutoff_date: Date threshold used.
         booking_url: Official booking portal URL.
 
     Returns:
         Formatted multi-line string.
     """
-    lines = [f"Early NJ MVC Appointments before {cutoff_date}:", ""]
-    for r in rows:
-        lines.append(f"- {r['Location']}: {r['Next Available']} | Map: {r['Map Link']}")
-    lines += ["", f"Book here: {booking_url}", "Automated notice."]
-    return "\n".join(lines)
+    return "\n".join(
+        itertools.chain(
+            (f"Early NJ MVC Appointments before {cutoff_date}:", ""),
+            (
+                f"- {location}: {_display_date(next_available)} | Map: {map_link}"
+                for location, next_available, map_link in rows
+            ),
+            ("", f"Book here: {booking_url}", "Automated notice."),
+        )
+    )
 
 
-def filter_new_earliest(early_rows: List[dict], state: Dict[str, str]) -> List[dict]:
+def filter_new_earliest(
+    early_rows: Iterable[AppointmentRow], state: Dict[str, StateEntry]
+) -> List[AppointmentRow]:
     """
     Return rows that are new earlier appointments (per location).
 
     Args:
-        early_rows: Candidate early appointment rows.
+        early_rows: Candidate early (Location, Next Available, Map Link) tuples.
         state: Mapping of previously notified earliest times.
 
     Returns:
         Subset of early_rows that represent a strictly earlier time or a new location.
     """
-    new_rows: List[dict] = []
+    if not early_rows:
+        return []
+    if not state:
+        # Nothing notified yet: every candidate is new
+        return list(early_rows)
+
+    new_rows: List[AppointmentRow] = []
     for row in early_rows:
-        loc = row["Location"]
-        current_str = row["Next Available"]
-        prev_str = state.get(loc)
-        try:
-            current_dt = datetime.strptime(current_str, "%Y-%m-%d %I:%M %p")
-            prev_dt = (
-                datetime.strptime(prev_str, "%Y-%m-%d %I:%M %p") if prev_str else None
-            )
-            if prev_dt is None or current_dt < prev_dt:
-                new_rows.append(row)
-        except Exception:
-            # Treat unparsable as new (safe fallback).
+        loc, current_str, _ = row
+        current_epoch = _state_epoch(current_str)
+        prev_epoch = _state_epoch(state.get(loc))
+        # Unparsable on either side is treated as new (safe fallback).
+        if current_epoch is None or prev_epoch is None or current_epoch < prev_epoch:
             new_rows.append(row)
     return new_rows
 
 
+async def notify_all(new_rows: List[AppointmentRow], cutoff_date, booking_url: str) -> None:
+    """
+    Send a single email covering every new alert from one poll cycle.
+
+    Args:
+        new_rows: All rows returned by `filter_new_earliest` for this cycle.
+        cutoff_date: Date threshold used.
+        booking_url: Official booking portal URL.
+    """
+    if not new_rows:
+        return
+    body = prepare_notification_body(new_rows, cutoff_date, booking_url)
+    await send_email("Earlier Appointment Found", body)
+
+
 # --------------------------------------------------------------------------------------
 # CLI Test Harness
 # --------------------------------------------------------------------------------------
@@ -254,9 +551,22 @@ def main():
         print("---- END DRY RUN ----")
         return
 
-    import asyncio
+    # libuv-backed loop for the SMTP/TLS round-trips (optional; not on Windows)
+    if not sys.platform.startswith("win"):
+        try:
+            import uvloop
+
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        except ImportError:
+            pass
+
+    async def _send_once():
+        try:
+            await send_email(args.subject, args.body)
+        finally:
+            await close_smtp()
 
-    asyncio.run(send_email(args.subject, args.body))
+    asyncio.run(_send_once())
 
 
 if __name__ == "__main__":